@@ -0,0 +1,305 @@
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+# --- 定数定義 ---
+DEFAULT_TOP = 50  # 表示件数
+
+# --- 関数定義 ---
+
+def load_companies(file_path):
+    """
+    複数社分の取得結果JSONを読み込み、企業データのリストを返す。
+    shikiho_async_scraper.py --with-analytics の出力 ({"データ": [...]} 形式)、または企業データのリストに対応。
+    "shimen_results" も "series" も持つ企業が1社もない場合は ValueError を送出する。
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        companies = data.get('データ', [])
+    elif isinstance(data, list):
+        companies = data
+    else:
+        raise ValueError("サポートされているデータ形式は {\"データ\": [...]} または企業データのリストです")
+
+    if not any(company.get("shimen_results") or company.get("series") for company in companies):
+        raise ValueError("shimen_results または series を持つ企業がありません。shikiho_async_scraper.py を --with-analytics 付きで実行してください")
+    return companies
+
+def _to_float(value):
+    """数値または '1,234' 形式の文字列を float に変換する。変換できない場合は NaN"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(',', ''))
+        except ValueError:
+            return np.nan
+    return np.nan
+
+def _select_results(results, period_field=None, row_filters=None):
+    """
+    shimen_results の行を row_filters ({フィールド名: 値}) に一致するものに絞り込み、
+    period_field が指定されていればその値の昇順に並べ替える。period_field のない行は除外する
+    """
+    rows = [item for item in results if isinstance(item, dict)]
+    if row_filters:
+        rows = [item for item in rows if all(str(item.get(key)) == value for key, value in row_filters.items())]
+    if period_field:
+        rows = sorted((item for item in rows if item.get(period_field) not in (None, "")), key=lambda item: str(item[period_field]))
+    return rows
+
+def build_results_matrix(companies, field, period_field=None, row_filters=None):
+    """
+    各社の shimen_results から指定フィールドを取り出し、(企業数 × 期数) の配列を作る。
+    行の選択と並べ替えは _select_results に従い、period_field がなければ元の並び (末尾が最新) を使う。
+    期数の少ない企業は左側を NaN で埋めて右詰めにする。
+    """
+    rows = []
+    for company in companies:
+        results = _select_results(company.get("shimen_results") or [], period_field, row_filters)
+        rows.append([_to_float(item.get(field)) for item in results])
+
+    width = max((len(row) for row in rows), default=0)
+    matrix = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        if row:
+            matrix[i, width - len(row):] = row
+    return matrix
+
+def build_headword_matrix(companies):
+    """
+    各社の series から業績欄見出し(headword1)と号の識別キーを取り出し、
+    (企業数 × 月数) の文字列配列を2つ返す。月の並びは末尾を揃えた右詰めで、見出しのない月は空文字列。
+    号の識別キーは magazine の calendar と series から作り、ない場合は月ごとに別の号 ("#月番号") とみなす。
+    JSON の読み出しは1回の走査で平坦なリストにまとめ、配列への格納はまとめて行う。
+    """
+    series_list = [company.get("series") or [] for company in companies]
+    width = max((len(series) for series in series_list), default=0)
+
+    rows, cols, words, keys = [], [], [], []
+    for i, series in enumerate(series_list):
+        offset = width - len(series)
+        for j, item in enumerate(series):
+            headword = item.get("headWord") if isinstance(item, dict) else None
+            if not headword or not headword.get("headword1"):
+                continue
+            magazine = headword.get("magazine") or {}
+            issue_key = f"{magazine.get('calendar', '')}-{magazine.get('series', '')}"
+            rows.append(i)
+            cols.append(offset + j)
+            words.append(headword["headword1"])
+            keys.append(issue_key if issue_key != "-" else f"#{j}")
+
+    words = np.array(words, dtype=str)
+    keys = np.array(keys, dtype=str)
+    headwords = np.full((len(series_list), width), "", dtype=words.dtype)
+    issues = np.full((len(series_list), width), "", dtype=keys.dtype)
+    headwords[rows, cols] = words
+    issues[rows, cols] = keys
+    return headwords, issues
+
+def _growth(matrix):
+    """前期比の伸び率 (最新, 前回) を返す。前期値の絶対値で割るため赤字期をまたいでも符号が保たれる"""
+    if matrix.shape[1] < 3:
+        nan = np.full(matrix.shape[0], np.nan)
+        return nan, nan
+    prev = matrix[:, -3:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (matrix[:, -2:] - prev) / np.abs(prev)
+    growth[~np.isfinite(growth)] = np.nan
+    return growth[:, 1], growth[:, 0]
+
+def _trend_labels(latest, previous, up, down):
+    """
+    伸び率の符号の変化から「増収→減収」のような判定ラベルを配列で返す。
+    伸び率がちょうど 0 (横ばい) の期は増減どちらでもないため転換とみなさない
+    """
+    before = np.where(previous > 0, up, down)
+    after = np.where(latest > 0, up, down)
+    changed = np.isfinite(latest) & np.isfinite(previous) & (np.sign(latest) * np.sign(previous) < 0)
+    return changed, np.where(changed, np.char.add(np.char.add(before, "→"), after), "")
+
+def screen_trend_changes(companies, revenue_field, profit_field, period_field=None, row_filters=None):
+    """
+    shimen_results の売上・利益の前期比が、前回と最新で符号の変わった企業を抽出する。
+    実績・予想・中間期が混在する場合は row_filters と period_field で同じ種類の連続した期に揃えること。
+    利益の伸び率の変化幅が大きい順に並べた結果のリストを返す。
+    """
+    revenue_latest, revenue_previous = _growth(build_results_matrix(companies, revenue_field, period_field, row_filters))
+    profit_latest, profit_previous = _growth(build_results_matrix(companies, profit_field, period_field, row_filters))
+
+    revenue_changed, revenue_labels = _trend_labels(revenue_latest, revenue_previous, "増収", "減収")
+    profit_changed, profit_labels = _trend_labels(profit_latest, profit_previous, "増益", "減益")
+
+    score = np.abs(profit_latest - profit_previous)
+    score = np.where(np.isfinite(score), score, np.abs(revenue_latest - revenue_previous))
+    score = np.where(np.isfinite(score), score, -np.inf)
+    hits = np.flatnonzero(revenue_changed | profit_changed)
+    ranked = hits[np.argsort(-score[hits], kind='stable')]
+
+    results = []
+    for i in ranked:
+        company = companies[i]
+        results.append({
+            "証券コード": company.get("証券コード", ""),
+            "社名": company.get("社名", ""),
+            "売上前期比(前回)": _round_or_none(revenue_previous[i]),
+            "売上前期比(最新)": _round_or_none(revenue_latest[i]),
+            "利益前期比(前回)": _round_or_none(profit_previous[i]),
+            "利益前期比(最新)": _round_or_none(profit_latest[i]),
+            "判定": " / ".join(label for label in (revenue_labels[i], profit_labels[i]) if label),
+        })
+    return results
+
+def screen_headword_changes(companies):
+    """
+    series の最新号の業績欄見出し(headword1)が、前号の見出しと異なる企業を抽出する。
+    最新号の新しい順 (同じ号なら証券コード順) に並べた結果のリストを返す。
+    """
+    headwords, issues = build_headword_matrix(companies)
+    count, width = headwords.shape
+    if width == 0:
+        return []
+
+    rows = np.arange(count)
+    present = headwords != ""
+    has_latest = present.any(axis=1)
+    latest_pos = width - 1 - np.argmax(present[:, ::-1], axis=1)
+
+    # 最新号と異なる号のうち最も新しい位置を前号とする
+    earlier = present & (issues != issues[rows, latest_pos][:, None])
+    has_previous = earlier.any(axis=1)
+    previous_pos = width - 1 - np.argmax(earlier[:, ::-1], axis=1)
+
+    latest = headwords[rows, latest_pos]
+    previous = headwords[rows, previous_pos]
+    hits = np.flatnonzero(has_latest & has_previous & (latest != previous))
+
+    codes = np.array([str(companies[i].get("証券コード", "")) for i in hits], dtype=str)
+    ranked = hits[np.lexsort((codes, -latest_pos[hits]))]
+
+    results = []
+    for i in ranked:
+        company = companies[i]
+        issue = str(issues[i, latest_pos[i]])
+        results.append({
+            "証券コード": company.get("証券コード", ""),
+            "社名": company.get("社名", ""),
+            "最新号": "" if issue.startswith("#") else issue,
+            "前号の見出し": str(previous[i]),
+            "最新号の見出し": str(latest[i]),
+        })
+    return results
+
+def _round_or_none(value):
+    """NaN は None に、それ以外は小数第4位で丸めた float にする"""
+    return None if np.isnan(value) else round(float(value), 4)
+
+def _format_cell(value):
+    """テーブル表示用に値を文字列化する。伸び率はパーセント表記"""
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:+.1%}"
+    return str(value)
+
+def print_screen_results(title, results, top):
+    """スクリーニング結果を上位 top 件までテーブル形式で表示する"""
+    console = Console()
+    print(f"\n--- {title} ({len(results)}社) ---")
+    if not results:
+        print("該当する企業はありません。")
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("順位", style="cyan", justify="right")
+    for column in results[0]:
+        table.add_column(column)
+    for rank, row in enumerate(results[:top], start=1):
+        table.add_row(str(rank), *(_format_cell(value) for value in row.values()))
+    console.print(table)
+
+def print_results_fields(companies):
+    """shimen_results を持つ最初の企業について、各行のフィールド名と値をテーブル形式で表示する"""
+    for company in companies:
+        results = [item for item in company.get("shimen_results") or [] if isinstance(item, dict)]
+        if results:
+            break
+    else:
+        print("shimen_results を持つ企業がありません。")
+        return
+
+    fields = list(dict.fromkeys(key for item in results for key in item))
+    table = Table(show_header=True, header_style="bold magenta")
+    for field in fields:
+        table.add_column(field)
+    for item in results:
+        table.add_row(*(str(item.get(field, "")) for field in fields))
+    print(f"\n--- shimen_results のフィールド ({company.get('証券コード', '')} {company.get('社名', '')}) ---")
+    Console().print(table)
+
+def main():
+    parser = argparse.ArgumentParser(description="複数社の shimen_results と時系列データを一括でスクリーニングします。")
+    parser.add_argument("file_path", type=str, help="企業データJSONファイル (shimen_results と series を含む)")
+    parser.add_argument("--screen", "-s", choices=["trend", "headword", "all"], default="all", help="実行するスクリーニング")
+    parser.add_argument("--revenue-field", type=str, help="shimen_results の売上高フィールド名 (trend に必須)")
+    parser.add_argument("--profit-field", type=str, help="shimen_results の利益フィールド名 (trend に必須)")
+    parser.add_argument("--period-field", type=str, help="shimen_results の決算期フィールド名 (指定するとその昇順に並べ替え)")
+    parser.add_argument("--filter", dest="row_filters", action="append", default=[], metavar="FIELD=VALUE", help="shimen_results の行を絞り込む条件 (複数指定可)")
+    parser.add_argument("--list-fields", action="store_true", help="shimen_results のフィールド名と値の例を表示して終了")
+    parser.add_argument("--top", "-n", type=int, default=DEFAULT_TOP, help="表示件数")
+    parser.add_argument("--output", "-o", type=str, help="結果を保存するJSONファイル名")
+    args = parser.parse_args()
+
+    row_filters = {}
+    for condition in args.row_filters:
+        key, sep, value = condition.partition("=")
+        if not sep or not key:
+            parser.error(f"--filter は FIELD=VALUE 形式で指定してください: {condition}")
+        row_filters[key] = value
+
+    try:
+        companies = load_companies(args.file_path)
+    except (OSError, ValueError) as e:
+        print(f"エラー: 企業データの読み込みに失敗しました: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{len(companies)}社のデータを読み込みました: {args.file_path}")
+
+    if args.list_fields:
+        print_results_fields(companies)
+        return
+
+    run_trend = args.screen in ("trend", "all")
+    if run_trend and not (args.revenue_field and args.profit_field):
+        if args.screen == "trend":
+            parser.error("trend には --revenue-field と --profit-field が必要です (--list-fields でフィールド名を確認できます)")
+        print("--revenue-field と --profit-field が未指定のため、業績トレンド転換スクリーニングを省略します。")
+        run_trend = False
+
+    output = {}
+    if run_trend:
+        start_time = time.time()
+        results = screen_trend_changes(companies, args.revenue_field, args.profit_field, args.period_field, row_filters)
+        print(f"業績トレンド転換スクリーニング: {time.time() - start_time:.2f}秒")
+        print_screen_results("業績トレンド転換", results, args.top)
+        output["業績トレンド転換"] = results
+
+    if args.screen in ("headword", "all"):
+        start_time = time.time()
+        results = screen_headword_changes(companies)
+        print(f"見出し変化スクリーニング: {time.time() - start_time:.2f}秒")
+        print_screen_results("業績欄見出しの変化", results, args.top)
+        output["業績欄見出しの変化"] = results
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        print(f"\n結果を保存しました: {args.output}")
+
+if __name__ == "__main__":
+    main()
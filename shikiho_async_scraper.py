@@ -16,6 +16,7 @@ SSO_CHECK_URL = "https://api-shikiho.toyokeizai.net/sso/v1/sso/check"
 API_BASE_URL = "https://api-shikiho.toyokeizai.net/stocks/v1/stocks"
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
 STORAGE_STATE_PATH = "playwright_user_data/state.json"
+TIMESERIES_BASE_URL = "https://api-shikiho.toyokeizai.net/timeseries/v1/timeseries/1"
 CONCURRENT_LIMIT = 300  # 同時実行数
 
 def load_stock_codes(file_path):
@@ -35,8 +36,11 @@ def load_stock_codes(file_path):
     else:
         raise ValueError("サポートされているファイル形式は JSON または CSV です")
 
-async def fetch_shikiho_articles(page, stock_code):
-    """指定された証券コードの四季報記事のみを取得（非同期版）"""
+async def fetch_shikiho_articles(page, stock_code, with_analytics=False):
+    """
+    指定された証券コードの四季報記事を取得（非同期版）
+    with_analytics が True の場合は shikiho_analytics.py 用に shimen_results と series も取得する
+    """
     try:
         # SSO認証チェック
         sso_response = await page.request.get(SSO_CHECK_URL, headers={
@@ -60,7 +64,29 @@ async def fetch_shikiho_articles(page, stock_code):
             "社名": header_data.get("company_name_j", ""),
             "四季報記事": header_data.get("shimen_articles", [])
         }
-        
+
+        if with_analytics:
+            # 最新情報APIから shimen_results を取得
+            latest_url = f"{API_BASE_URL}/{stock_code}/latest"
+            latest_response = await page.request.get(latest_url, headers={
+                "Referer": f"https://shikiho.toyokeizai.net/stocks/{stock_code}"
+            })
+            if not latest_response.ok:
+                raise PlaywrightError(f"/latest APIの取得に失敗: {latest_response.status}")
+            latest_data = await latest_response.json()
+            result["shimen_results"] = latest_data.get("shimen_results", [])
+
+            # 時系列データAPIから series を取得（失敗しても記事は保存する）
+            timeseries_url = f"{TIMESERIES_BASE_URL}/{stock_code}?cycle=m&term=240m&addtionalFields=headWord&format=epocmilli&market=prime"
+            timeseries_response = await page.request.get(timeseries_url, headers={
+                "Referer": f"https://shikiho.toyokeizai.net/stocks/{stock_code}"
+            })
+            if timeseries_response.ok:
+                timeseries_data = await timeseries_response.json()
+                result["series"] = timeseries_data.get("series", [])
+            else:
+                print(f"警告: 時系列API取得に失敗: {stock_code} {timeseries_response.status}")
+
         return result
 
     except PlaywrightError as e:
@@ -118,13 +144,13 @@ async def perform_new_login(browser, user_id, password):
         await context.close()
         return None, None
 
-async def process_stock_code(semaphore, page, stock_code, progress, task, console):
+async def process_stock_code(semaphore, page, stock_code, progress, task, console, with_analytics=False):
     """個別の証券コードを処理（セマフォ制御付き）"""
     async with semaphore:
         try:
             progress.update(task, description=f"[cyan]処理中: {stock_code}")
             
-            result = await fetch_shikiho_articles(page, stock_code)
+            result = await fetch_shikiho_articles(page, stock_code, with_analytics)
             
             if result is None: # SSOチェック失敗時
                 console.print(f"[red]SSOチェックに失敗しました: {stock_code}")
@@ -162,6 +188,7 @@ async def main_async():
     parser.add_argument("file_path", type=str, help="証券コードリストファイル (JSON または CSV)")
     parser.add_argument("--output", "-o", type=str, default="shikiho_articles_async.json", help="出力ファイル名")
     parser.add_argument("--concurrent", "-c", type=int, default=CONCURRENT_LIMIT, help="同時実行数")
+    parser.add_argument("--with-analytics", "-a", action="store_true", help="shikiho_analytics.py 用に最新情報(shimen_results)と時系列データ(series)も取得")
     args = parser.parse_args()
 
     user_id = os.getenv("SHIKIHO_ID")
@@ -239,7 +266,7 @@ async def main_async():
                 # 非同期タスクを作成
                 tasks = []
                 for stock_code in stock_codes:
-                    task_coro = process_stock_code(semaphore, page, stock_code, progress, task, console)
+                    task_coro = process_stock_code(semaphore, page, stock_code, progress, task, console, args.with_analytics)
                     tasks.append(task_coro)
 
                 # 全タスクを並行実行
@@ -286,7 +313,7 @@ async def main_async():
                         # 再試行用のタスクを作成
                         retry_tasks = []
                         for stock_code in sso_failed_codes:
-                            task_coro = process_stock_code(semaphore, page, stock_code, progress, task, console)
+                            task_coro = process_stock_code(semaphore, page, stock_code, progress, task, console, args.with_analytics)
                             retry_tasks.append(task_coro)
                         
                         # 再試行を実行
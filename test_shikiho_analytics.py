@@ -0,0 +1,120 @@
+import json
+import numpy as np
+import pytest
+
+from shikiho_analytics import (
+    build_headword_matrix,
+    build_results_matrix,
+    load_companies,
+    screen_headword_changes,
+    screen_trend_changes,
+)
+
+
+def make_company(code, results=None, headwords=None):
+    """テスト用の企業データを作る。headwords は (headword1, calendar, series) のリストで、None は見出しのない月"""
+    company = {"証券コード": code, "社名": f"社{code}"}
+    if results is not None:
+        company["shimen_results"] = results
+    if headwords is not None:
+        series = []
+        for entry in headwords:
+            if entry is None:
+                series.append({})
+            else:
+                word, calendar, number = entry
+                series.append({"headWord": {"headword1": word, "magazine": {"calendar": calendar, "series": number}}})
+        company["series"] = series
+    return company
+
+
+def rows(*values):
+    return [{"sales": sales, "profit": profit} for sales, profit in values]
+
+
+def test_build_results_matrix_right_aligns_with_nan():
+    companies = [make_company("1000", rows((1, 1), (2, 2), (3, 3))), make_company("1001", rows((5, 5)))]
+    matrix = build_results_matrix(companies, "sales")
+    assert matrix.shape == (2, 3)
+    assert matrix[0].tolist() == [1.0, 2.0, 3.0]
+    assert np.isnan(matrix[1, :2]).all()
+    assert matrix[1, 2] == 5.0
+
+
+def test_build_results_matrix_filters_and_sorts_periods():
+    results = [
+        {"period": "2024.03", "kind": "実績", "sales": 110},
+        {"period": "2026.03", "kind": "予想", "sales": 999},
+        {"period": "2023.03", "kind": "実績", "sales": 100},
+        {"period": "2025.03", "kind": "実績", "sales": 90},
+    ]
+    matrix = build_results_matrix([make_company("1000", results)], "sales", "period", {"kind": "実績"})
+    assert matrix[0].tolist() == [100.0, 110.0, 90.0]
+
+
+def test_screen_trend_changes_detects_sign_change():
+    companies = [
+        make_company("1000", rows((100, 100), (110, 120), (120, 90))),  # 増収継続・増益→減益
+        make_company("1001", rows((100, 100), (110, 110), (120, 120))),  # 変化なし
+    ]
+    results = screen_trend_changes(companies, "sales", "profit")
+    assert [r["証券コード"] for r in results] == ["1000"]
+    assert results[0]["判定"] == "増益→減益"
+    assert results[0]["利益前期比(前回)"] == 0.2
+    assert results[0]["利益前期比(最新)"] == -0.25
+
+
+def test_screen_trend_changes_treats_zero_growth_as_flat():
+    companies = [
+        make_company("1000", rows((100, 100), (100, 100), (90, 90))),  # 横ばい→減
+        make_company("1001", rows((100, 100), (100, 100), (110, 110))),  # 横ばい→増
+    ]
+    assert screen_trend_changes(companies, "sales", "profit") == []
+
+
+def test_screen_trend_changes_needs_three_periods():
+    companies = [make_company("1000", rows((100, 100), (90, 90))), make_company("1001")]
+    assert screen_trend_changes(companies, "sales", "profit") == []
+
+
+def test_build_headword_matrix_right_aligns_series():
+    companies = [
+        make_company("1000", headwords=[("増益", "2024", "1"), None, ("減益", "2024", "2")]),
+        make_company("1001", headwords=[("続伸", "2024", "2")]),
+        make_company("1002"),
+    ]
+    headwords, issues = build_headword_matrix(companies)
+    assert headwords.tolist() == [["増益", "", "減益"], ["", "", "続伸"], ["", "", ""]]
+    assert issues[1, 2] == "2024-2"
+
+
+def test_screen_headword_changes_uses_previous_issue_across_months():
+    companies = [
+        # 最新号が3ヶ月続いても、比較相手は同じ号ではなく前号
+        make_company("1000", headwords=[("増益", "2024", "1"), ("浮上", "2024", "2"), ("浮上", "2024", "2"), ("浮上", "2024", "2")]),
+        # 同じ号が続くだけで前号がない
+        make_company("1001", headwords=[("続伸", "2024", "2"), ("続伸", "2024", "2")]),
+        # 前号と同じ見出し
+        make_company("1002", headwords=[("一服", "2024", "1"), ("一服", "2024", "2")]),
+        # series なし
+        make_company("1003"),
+    ]
+    results = screen_headword_changes(companies)
+    assert results == [{"証券コード": "1000", "社名": "社1000", "最新号": "2024-2", "前号の見出し": "増益", "最新号の見出し": "浮上"}]
+    assert type(results[0]["前号の見出し"]) is str
+
+
+def test_screen_headword_changes_ranks_newest_issue_first():
+    companies = [
+        make_company("1000", headwords=[("増益", "2024", "1"), ("減益", "2024", "2"), None]),
+        make_company("1001", headwords=[None, ("増益", "2024", "2"), ("減益", "2024", "3")]),
+        make_company("0999", headwords=[None, ("増益", "2024", "2"), ("続伸", "2024", "3")]),
+    ]
+    assert [r["証券コード"] for r in screen_headword_changes(companies)] == ["0999", "1001", "1000"]
+
+
+def test_load_companies_rejects_articles_only_data(tmp_path):
+    path = tmp_path / "articles.json"
+    path.write_text(json.dumps({"データ": [{"証券コード": "1000", "社名": "社1000", "四季報記事": []}]}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_companies(str(path))